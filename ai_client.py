@@ -6,9 +6,9 @@ import uuid
 from typing import Any, Optional, List, Dict, Tuple
 
 import httpx
-from dotenv import load_dotenv
+from config import load_env
 
-load_dotenv()
+load_env()
 
 AI_WEBHOOK_URL = (os.getenv("AI_WEBHOOK_URL") or "").strip()
 
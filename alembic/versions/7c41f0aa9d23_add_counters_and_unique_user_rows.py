@@ -0,0 +1,115 @@
+"""add suggestion counters + one-row-per-user uniques
+
+Revision ID: 7c41f0aa9d23
+Revises: 1814b8b22f0e
+Create Date: 2026-08-29 11:02:47.590312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41f0aa9d23'
+down_revision: Union[str, Sequence[str], None] = '1814b8b22f0e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # sayaç kolonları yoksa ekle + mevcut reaksiyon/yorumlardan doldur
+    # (backfill sadece kolonlar ilk eklendiğinde çalışır)
+    op.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name='suggestions' AND column_name='likes_count'
+        ) THEN
+            ALTER TABLE suggestions
+                ADD COLUMN likes_count INTEGER DEFAULT 0 NOT NULL,
+                ADD COLUMN dislikes_count INTEGER DEFAULT 0 NOT NULL,
+                ADD COLUMN comments_count INTEGER DEFAULT 0 NOT NULL;
+
+            UPDATE suggestions s SET
+                likes_count = COALESCE(r.likes, 0),
+                dislikes_count = COALESCE(r.dislikes, 0)
+            FROM (
+                SELECT suggestion_id,
+                       COUNT(*) FILTER (WHERE reaction = 'like') AS likes,
+                       COUNT(*) FILTER (WHERE reaction = 'dislike') AS dislikes
+                FROM suggestion_reactions
+                GROUP BY suggestion_id
+            ) r
+            WHERE r.suggestion_id = s.id;
+
+            UPDATE suggestions s SET comments_count = c.cnt
+            FROM (
+                SELECT suggestion_id, COUNT(*) AS cnt
+                FROM suggestion_comments
+                GROUP BY suggestion_id
+            ) c
+            WHERE c.suggestion_id = s.id;
+        END IF;
+    END $$;
+    """)
+
+    # gamification: kullanıcı başına tek satır bırak (en yüksek puanlı kalır),
+    # sonra ON CONFLICT (user_id) için unique index
+    op.execute("""
+    DELETE FROM gamification g
+    USING gamification keep
+    WHERE keep.user_id = g.user_id
+      AND (keep.points, keep.id) > (g.points, g.id);
+    """)
+    op.execute("""
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+            WHERE c.relname = 'ix_gamification_user_id' AND NOT i.indisunique
+        ) THEN
+            DROP INDEX ix_gamification_user_id;
+        END IF;
+    END $$;
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_gamification_user_id ON gamification (user_id);"
+    )
+
+    # user_profiles: aynı şekilde tek satır (en yeni kalır) + unique index
+    op.execute("""
+    DELETE FROM user_profiles p
+    USING user_profiles keep
+    WHERE keep.user_id = p.user_id
+      AND keep.id > p.id;
+    """)
+    op.execute("""
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+            WHERE c.relname = 'ix_user_profiles_user_id' AND NOT i.indisunique
+        ) THEN
+            DROP INDEX ix_user_profiles_user_id;
+        END IF;
+    END $$;
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_user_profiles_user_id ON user_profiles (user_id);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_user_profiles_user_id;")
+    op.execute("CREATE INDEX ix_user_profiles_user_id ON user_profiles (user_id);")
+    op.execute("DROP INDEX IF EXISTS ix_gamification_user_id;")
+    op.execute("CREATE INDEX ix_gamification_user_id ON gamification (user_id);")
+    op.drop_column("suggestions", "comments_count")
+    op.drop_column("suggestions", "dislikes_count")
+    op.drop_column("suggestions", "likes_count")
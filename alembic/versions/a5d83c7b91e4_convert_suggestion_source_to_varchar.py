@@ -0,0 +1,67 @@
+"""convert suggestion source enum to varchar + check
+
+Revision ID: a5d83c7b91e4
+Revises: 7c41f0aa9d23
+Create Date: 2026-08-29 13:21:08.114925
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d83c7b91e4'
+down_revision: Union[str, Sequence[str], None] = '7c41f0aa9d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1814b8b22f0e kolonu ENUM olarak açtı; model artık varchar(16) + CHECK
+    # bekliyor. Kolon hâlâ enum'sa çevir (taze kurulumlarda create_all zaten
+    # varchar açtığı için guard atlar).
+    op.execute("""
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name='suggestions' AND column_name='source'
+              AND udt_name='suggestion_source'
+        ) THEN
+            ALTER TABLE suggestions
+                ALTER COLUMN source TYPE varchar(16) USING source::text,
+                ALTER COLUMN source SET DEFAULT 'user';
+        END IF;
+    END $$;
+    """)
+
+    # check yoksa ekle — yeni bir kaynak değeri artık ALTER TYPE değil,
+    # sadece bu constraint'in güncellenmesi demek
+    op.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'ck_suggestion_source'
+        ) THEN
+            ALTER TABLE suggestions
+                ADD CONSTRAINT ck_suggestion_source
+                CHECK (source IN ('user', 'ai', 'system'));
+        END IF;
+    END $$;
+    """)
+
+    # artık hiçbir kolon kullanmıyor
+    op.execute("DROP TYPE IF EXISTS suggestion_source;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE suggestions DROP CONSTRAINT IF EXISTS ck_suggestion_source;")
+    op.execute("CREATE TYPE suggestion_source AS ENUM ('user','ai','system');")
+    op.execute("ALTER TABLE suggestions ALTER COLUMN source DROP DEFAULT;")
+    op.execute(
+        "ALTER TABLE suggestions ALTER COLUMN source TYPE suggestion_source "
+        "USING source::suggestion_source;"
+    )
@@ -0,0 +1,97 @@
+"""create hot-path indexes concurrently, drop superseded singles
+
+Revision ID: b9e2d4c6f801
+Revises: a5d83c7b91e4
+Create Date: 2026-08-29 13:24:41.882170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e2d4c6f801'
+down_revision: Union[str, Sequence[str], None] = 'a5d83c7b91e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# models.py __table_args__ ile birebir aynı tanımlar; create_all mevcut
+# tabloları değiştirmediği için canlı DB bunları sadece buradan alır.
+_CREATE = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_moods_user_created "
+    "ON moods (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestions_user_created "
+    "ON suggestions (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestions_ai_approved "
+    "ON suggestions (created_at) WHERE source IN ('ai', 'system') AND is_approved",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestions_feed_created "
+    "ON suggestions (created_at) WHERE source = 'user' AND is_approved",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_reactions_user_created "
+    "ON suggestion_reactions (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_reactions_user_like_created "
+    "ON suggestion_reactions (user_id, created_at) WHERE reaction = 'like'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_reactions_suggestion_reaction "
+    "ON suggestion_reactions (suggestion_id, reaction)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_saves_user_created "
+    "ON suggestion_saves (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_comments_user_created "
+    "ON suggestion_comments (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_comments_suggestion_created "
+    "ON suggestion_comments (suggestion_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_characters_active "
+    "ON user_characters (user_id) WHERE is_active",
+)
+
+# Bileşiklerin/uniq constraint'lerin öncü kolonlarıyla gereksizleşen tekli
+# index'ler — yazma başına index maliyetini düşürmek için kalkıyor.
+_DROP = (
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_suggestion_reactions_suggestion_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_suggestion_saves_suggestion_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_user_daily_suggestions_user_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_global_daily_suggestions_day",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_user_characters_user_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_reward_claims_user_id",
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY transaction içinde çalışmaz; autocommit bloğu şart
+    with op.get_context().autocommit_block():
+        for stmt in _CREATE:
+            op.execute(stmt)
+        for stmt in _DROP:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for stmt in _CREATE:
+            name = stmt.split("IF NOT EXISTS ")[1].split(" ")[0]
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_reactions_suggestion_id "
+            "ON suggestion_reactions (suggestion_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_suggestion_saves_suggestion_id "
+            "ON suggestion_saves (suggestion_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_daily_suggestions_user_id "
+            "ON user_daily_suggestions (user_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_global_daily_suggestions_day "
+            "ON global_daily_suggestions (day)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_characters_user_id "
+            "ON user_characters (user_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reward_claims_user_id "
+            "ON reward_claims (user_id)"
+        )
@@ -1,6 +1,10 @@
 # character.py (ROUTER)  (REVIZE - FULL)
+import threading
+import time as time_mod
+
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -16,15 +20,44 @@ class CharacterDTO(BaseModel):
     asset_key: str
     cost: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# The shop catalog is effectively immutable outside the admin seed, so a
+# long-TTL in-process copy serves the GET without touching Postgres.
+_CATALOG_TTL_SECONDS = 3600.0
+_catalog_cache: "tuple[float, list[dict]] | None" = None
+_catalog_cache_lock = threading.Lock()
+
+
+def _bust_catalog_cache() -> None:
+    global _catalog_cache
+    with _catalog_cache_lock:
+        _catalog_cache = None
 
 
 @router.get("/characters", response_model=list[CharacterDTO])
 def get_shop_characters(db: Session = Depends(get_db)):
-    return db.query(Character).order_by(Character.id.asc()).all()
+    global _catalog_cache
+    with _catalog_cache_lock:
+        hit = _catalog_cache
+    if hit is not None and time_mod.monotonic() - hit[0] < _CATALOG_TTL_SECONDS:
+        return hit[1]
+
+    rows = [
+        dict(r)
+        for r in db.execute(
+            select(Character.id, Character.name, Character.asset_key, Character.cost)
+            .order_by(Character.id.asc())
+        ).mappings()
+    ]
+    with _catalog_cache_lock:
+        _catalog_cache = (time_mod.monotonic(), rows)
+    return rows
 
 
 @router.post("/admin/seed-characters")
 def admin_seed_characters(db: Session = Depends(get_db)):
-    return seed_characters_upsert(db)
+    result = seed_characters_upsert(db)
+    _bust_catalog_cache()
+    return result
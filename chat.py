@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
+import logging
 import re
 
 from fastapi import APIRouter, HTTPException, Depends, status
@@ -14,6 +15,8 @@ from auth import get_current_user
 
 from ai_client import generate_response, AIClientError
 
+logger = logging.getLogger("chat")
+
 router = APIRouter(prefix="/ai", tags=["AI"])
 
 
@@ -266,9 +269,12 @@ async def chat_with_ai(
         return ChatResponse(reply=reply)
 
     except AIClientError as e:
-        print("AIClientError:", str(e))
+        # logging instead of print: stdout writes block the coroutine (and
+        # everything else on the loop) until the pipe drains; the logging
+        # handler formats lazily and can be pointed at a queue.
+        logger.warning("AIClientError: %s", str(e))
         return ChatResponse(reply="Şu an cevap üretemedim. Bir daha dener misin?")
 
     except Exception as e:
-        print("Unexpected error in /ai/chat:", str(e))
+        logger.exception("Unexpected error in /ai/chat: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Beklenmeyen hata: {str(e)}")
@@ -0,0 +1,16 @@
+# config.py
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_env() -> bool:
+    """
+    Parse .env into os.environ exactly once per process.
+
+    main.py, database.py and ai_client.py each used to call load_dotenv()
+    at import time, re-reading and re-parsing the same file. Modules that
+    need env vars call load_env() instead; repeat calls are free.
+    """
+    return load_dotenv()
@@ -1,11 +1,11 @@
 import os
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from config import load_env
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-load_dotenv()
+load_env()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -41,11 +41,19 @@ engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=1800,
-    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
-    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
     pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
     echo=SQL_ECHO,
     future=True,
+    # Room for every distinct statement shape the app compiles; the default
+    # 500 can thrash once the suggestion/stats queries are all warm.
+    query_cache_size=1200,
+    # Multi-row INSERT batching is SQLA 2.0's built-in insertmanyvalues;
+    # psycopg2 fast-executemany covers the rest (bulk UPDATE/DELETE).
+    executemany_mode="values_plus_batch",
+    executemany_batch_page_size=500,
+    insertmanyvalues_page_size=1000,
     connect_args=connect_args,
 )
 
@@ -65,3 +73,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_db_ro():
+    """get_db for handlers that only read.
+
+    We run a single primary today, so this opens the transaction READ ONLY
+    on the same engine — Postgres skips write locking/WAL bookkeeping, and
+    an accidental write in a GET handler fails loudly. If a read replica is
+    ever added, only this dependency needs to point at it.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text("SET TRANSACTION READ ONLY"))
+        yield db
+    finally:
+        db.close()
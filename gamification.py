@@ -1,11 +1,12 @@
 # gamification.py
 
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import get_db
 from models import Gamification
+from stats import bust_today_stats
 
 router = APIRouter(prefix="/gamification", tags=["Gamification"])
 
@@ -20,17 +21,9 @@ class GamificationDTO(BaseModel):
     points: int
     badge_level: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 def calculate_badge(points: int) -> str:
     if points >= 200:
@@ -63,6 +56,9 @@ def add_points(
     record.badge_level = calculate_badge(record.points)
     db.commit()
     db.refresh(record)
+    # /stats/today reports points (and total_chats from them); don't let the
+    # cached payload lag behind this write.
+    bust_today_stats(payload.user_id)
     return record
 
 
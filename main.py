@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from pathlib import Path
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
+from config import load_env
 
-load_dotenv()
+load_env()
 
 from database import Base, engine
 from auth import router as auth_router
@@ -24,6 +29,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 @app.on_event("startup")
@@ -38,17 +44,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(auth_router)
-app.include_router(mood_router)
-app.include_router(chat_router)
-app.include_router(personality_router)
-app.include_router(suggestions_router)
-app.include_router(gamification_router)
-app.include_router(stats_router)
-app.include_router(user_router)
-app.include_router(characters_router)
-app.include_router(user_characters_router)
+_ROUTERS = (
+    auth_router,
+    mood_router,
+    chat_router,
+    personality_router,
+    suggestions_router,
+    gamification_router,
+    stats_router,
+    user_router,
+    characters_router,
+    user_characters_router,
+)
+
+for _router in _ROUTERS:
+    app.include_router(_router)
+
+# Building the OpenAPI schema walks every route + Pydantic model, which is
+# wasted work on each cold start. Cache the built schema on disk and reuse it
+# as long as the route set and source files have not changed.
+_OPENAPI_CACHE_FILE = Path(__file__).with_name("openapi_cache.json")
+
+
+def _openapi_etag() -> str:
+    parts = [app.title, app.version]
+    parts.extend(sorted(getattr(r, "path", "") for r in app.routes))
+    for py in sorted(Path(__file__).parent.glob("*.py")):
+        parts.append(f"{py.name}:{py.stat().st_mtime_ns}")
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def _load_or_build_openapi_schema() -> None:
+    etag = _openapi_etag()
+    try:
+        cached = json.loads(_OPENAPI_CACHE_FILE.read_text())
+        if cached.get("etag") == etag:
+            app.openapi_schema = cached["schema"]
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+
+    schema = app.openapi()
+    try:
+        _OPENAPI_CACHE_FILE.write_text(json.dumps({"etag": etag, "schema": schema}))
+    except OSError:
+        pass
+
 
 @app.get("/", tags=["Health"])
 def health_check():
     return {"status": "ok", "message": "Mindio backend is running"}
+
+_load_or_build_openapi_schema()
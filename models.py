@@ -5,25 +5,38 @@ from datetime import date
 
 from sqlalchemy import (
     Boolean,
+    CheckConstraint,
     Column,
     Date,
     DateTime,
-    Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     func,
+    # Aliased: Suggestion.text / SuggestionComment.text shadow the bare name
+    # inside their class bodies, where it would resolve to the Column.
+    text as sa_text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import configure_mappers, relationship
 
 from database import Base
 
+# Relationships deliberately stay on the default lazy="select" strategy.
+# The eager selectin default this file used to carry made every parent
+# fetch (notably the per-request User load in get_current_user) fan out
+# into one IN-query per collection even though no endpoint reads them.
+# Endpoints that do need children attach selectinload()/joinedload() at
+# the query site.
+
 
 # =========================
 # ENUMS
 # =========================
+# Kept for Python-side validation; the DB column is a plain String with a
+# CHECK constraint so adding a value never needs an ALTER TYPE.
 class SuggestionSource(str, enum.Enum):
     user = "user"
     ai = "ai"
@@ -43,27 +56,27 @@ class User(Base):
 
     birth_date = Column(Date, nullable=True)
 
-    onboarding_completed = Column(Boolean, nullable=False, server_default="0")
+    onboarding_completed = Column(Boolean, nullable=False, server_default=sa_text("false"))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relations
-    moods = relationship("Mood", back_populates="user", lazy="selectin")
-    suggestions = relationship("Suggestion", back_populates="user", lazy="selectin")
+    moods = relationship("Mood", back_populates="user", lazy="select")
+    suggestions = relationship("Suggestion", back_populates="user", lazy="select")
 
-    suggestion_reactions = relationship("SuggestionReaction", back_populates="user", lazy="selectin")
-    suggestion_saves = relationship("SuggestionSave", back_populates="user", lazy="selectin")
-    suggestion_comments = relationship("SuggestionComment", back_populates="user", lazy="selectin")
+    suggestion_reactions = relationship("SuggestionReaction", back_populates="user", lazy="select")
+    suggestion_saves = relationship("SuggestionSave", back_populates="user", lazy="select")
+    suggestion_comments = relationship("SuggestionComment", back_populates="user", lazy="select")
 
-    daily_suggestions = relationship("UserDailySuggestion", back_populates="user", lazy="selectin")
-    gamification_entries = relationship("Gamification", back_populates="user", lazy="selectin")
+    daily_suggestions = relationship("UserDailySuggestion", back_populates="user", lazy="select")
+    gamification_entries = relationship("Gamification", back_populates="user", lazy="select")
 
-    profiles = relationship("UserProfile", back_populates="user", lazy="selectin")
+    profiles = relationship("UserProfile", back_populates="user", lazy="select")
 
     # Shop / Characters
-    owned_characters = relationship("UserCharacter", back_populates="user", lazy="selectin")
+    owned_characters = relationship("UserCharacter", back_populates="user", lazy="select")
 
     # Rewards
-    reward_claims = relationship("RewardClaim", back_populates="user", lazy="selectin")
+    reward_claims = relationship("RewardClaim", back_populates="user", lazy="select")
 
 
 # =========================
@@ -73,7 +86,8 @@ class UserProfile(Base):
     __tablename__ = "user_profiles"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # one row per user; the unique index also enables ON CONFLICT upserts
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
 
     age_range = Column(String(50), nullable=True)
     gender = Column(String(50), nullable=True)
@@ -84,7 +98,7 @@ class UserProfile(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    user = relationship("User", back_populates="profiles", lazy="selectin")
+    user = relationship("User", back_populates="profiles", lazy="select")
 
 
 # =========================
@@ -94,12 +108,14 @@ class Mood(Base):
     __tablename__ = "moods"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     mood = Column(String(50), nullable=False)
     note = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    user = relationship("User", back_populates="moods", lazy="selectin")
+    __table_args__ = (Index("ix_moods_user_created", "user_id", "created_at"),)
+
+    user = relationship("User", back_populates="moods", lazy="select")
 
 
 # =========================
@@ -124,88 +140,143 @@ class PersonalityResponse(Base):
 # =========================
 class Suggestion(Base):
     __tablename__ = "suggestions"
+    # Populate server-side defaults (created_at, counters) via INSERT ..
+    # RETURNING so write handlers don't need a db.refresh() round trip.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     text = Column(String(500), nullable=False)
 
-    source = Column(
-        SAEnum(SuggestionSource, name="suggestion_source"),
-        nullable=False,
-        server_default="user",
-        index=True,
-    )
+    source = Column(String(16), nullable=False, server_default="user", index=True)
+
+    is_approved = Column(Boolean, nullable=False, server_default=sa_text("false"))
+
+    # Rolling counters maintained by the react/comment write paths so read
+    # endpoints don't re-aggregate suggestion_reactions per render.
+    likes_count = Column(Integer, nullable=False, server_default=sa_text("0"))
+    dislikes_count = Column(Integer, nullable=False, server_default=sa_text("0"))
+    comments_count = Column(Integer, nullable=False, server_default=sa_text("0"))
 
-    is_approved = Column(Boolean, nullable=False, server_default="false")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    user = relationship("User", back_populates="suggestions", lazy="selectin")
+    __table_args__ = (
+        CheckConstraint("source IN ('user', 'ai', 'system')", name="ck_suggestion_source"),
+        # Backstop for writes that bypass _validate_text (bulk ingest, ad-hoc
+        # SQL); the Python path still does the sanitizing and clamping.
+        CheckConstraint("char_length(text) BETWEEN 1 AND 500", name="ck_suggestion_text_length"),
+        Index("ix_suggestions_user_created", "user_id", "created_at"),
+        # The approved system/ai pool is a sliver of the table; a partial
+        # index keeps the daily-tip scan small and cache-resident.
+        Index(
+            "ix_suggestions_ai_approved",
+            "created_at",
+            postgresql_where=sa_text("source IN ('ai', 'system') AND is_approved"),
+        ),
+        # Community feed: WHERE source = 'user' AND is_approved
+        # ORDER BY created_at DESC LIMIT 200 — served straight off this
+        # partial index instead of a filtered sort.
+        Index(
+            "ix_suggestions_feed_created",
+            "created_at",
+            postgresql_where=sa_text("source = 'user' AND is_approved"),
+        ),
+    )
+
+    user = relationship("User", back_populates="suggestions", lazy="select")
 
-    reactions = relationship("SuggestionReaction", back_populates="suggestion", lazy="selectin")
-    saves = relationship("SuggestionSave", back_populates="suggestion", lazy="selectin")
-    comments = relationship("SuggestionComment", back_populates="suggestion", lazy="selectin")
+    reactions = relationship("SuggestionReaction", back_populates="suggestion", lazy="select")
+    saves = relationship("SuggestionSave", back_populates="suggestion", lazy="select")
+    comments = relationship("SuggestionComment", back_populates="suggestion", lazy="select")
 
-    daily_used_by = relationship("UserDailySuggestion", back_populates="suggestion", lazy="selectin")
+    daily_used_by = relationship("UserDailySuggestion", back_populates="suggestion", lazy="select")
 
 
 class SuggestionReaction(Base):
     __tablename__ = "suggestion_reactions"
 
     id = Column(Integer, primary_key=True, index=True)
-    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # covered by the leading column of uq_reaction_suggestion_user
+    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     reaction = Column(String(10), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    __table_args__ = (UniqueConstraint("suggestion_id", "user_id", name="uq_reaction_suggestion_user"),)
+    __table_args__ = (
+        UniqueConstraint("suggestion_id", "user_id", name="uq_reaction_suggestion_user"),
+        Index("ix_suggestion_reactions_user_created", "user_id", "created_at"),
+        # /stats/today only counts likes; the partial index keeps that scan
+        # off the dislike rows entirely.
+        Index(
+            "ix_suggestion_reactions_user_like_created",
+            "user_id",
+            "created_at",
+            postgresql_where=sa_text("reaction = 'like'"),
+        ),
+        # per-tip like/dislike tallies: WHERE suggestion_id = ? GROUP BY reaction
+        Index("ix_suggestion_reactions_suggestion_reaction", "suggestion_id", "reaction"),
+    )
 
-    user = relationship("User", back_populates="suggestion_reactions", lazy="selectin")
-    suggestion = relationship("Suggestion", back_populates="reactions", lazy="selectin")
+    user = relationship("User", back_populates="suggestion_reactions", lazy="select")
+    suggestion = relationship("Suggestion", back_populates="reactions", lazy="select")
 
 
 class SuggestionSave(Base):
     __tablename__ = "suggestion_saves"
 
     id = Column(Integer, primary_key=True, index=True)
-    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # covered by the leading column of uq_save_suggestion_user
+    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    __table_args__ = (UniqueConstraint("suggestion_id", "user_id", name="uq_save_suggestion_user"),)
+    __table_args__ = (
+        UniqueConstraint("suggestion_id", "user_id", name="uq_save_suggestion_user"),
+        # /suggestions/saved/me: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_suggestion_saves_user_created", "user_id", "created_at"),
+    )
 
-    user = relationship("User", back_populates="suggestion_saves", lazy="selectin")
-    suggestion = relationship("Suggestion", back_populates="saves", lazy="selectin")
+    user = relationship("User", back_populates="suggestion_saves", lazy="select")
+    suggestion = relationship("Suggestion", back_populates="saves", lazy="select")
 
 
 class SuggestionComment(Base):
     __tablename__ = "suggestion_comments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
-    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     text = Column(String(500), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    user = relationship("User", back_populates="suggestion_comments", lazy="selectin")
-    suggestion = relationship("Suggestion", back_populates="comments", lazy="selectin")
+    __table_args__ = (
+        Index("ix_suggestion_comments_user_created", "user_id", "created_at"),
+        # /suggestions/comment/{id}: WHERE suggestion_id = ? ORDER BY created_at DESC
+        Index("ix_suggestion_comments_suggestion_created", "suggestion_id", "created_at"),
+    )
+
+    user = relationship("User", back_populates="suggestion_comments", lazy="select")
+    suggestion = relationship("Suggestion", back_populates="comments", lazy="select")
 
 
 class UserDailySuggestion(Base):
     __tablename__ = "user_daily_suggestions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # covered by the leading column of uq_user_daily_suggestion
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False, index=True)
     day = Column(Date, nullable=False, default=date.today, index=True)
 
     __table_args__ = (UniqueConstraint("user_id", "day", name="uq_user_daily_suggestion"),)
 
-    user = relationship("User", back_populates="daily_suggestions", lazy="selectin")
-    suggestion = relationship("Suggestion", back_populates="daily_used_by", lazy="selectin")
+    user = relationship("User", back_populates="daily_suggestions", lazy="select")
+    suggestion = relationship("Suggestion", back_populates="daily_used_by", lazy="select")
 
 
 class GlobalDailySuggestion(Base):
@@ -213,7 +284,8 @@ class GlobalDailySuggestion(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     suggestion_id = Column(Integer, ForeignKey("suggestions.id"), nullable=False, index=True)
-    day = Column(Date, nullable=False, default=date.today, index=True)
+    # covered by uq_global_daily_suggestion_day
+    day = Column(Date, nullable=False, default=date.today)
 
     __table_args__ = (UniqueConstraint("day", name="uq_global_daily_suggestion_day"),)
 
@@ -225,12 +297,13 @@ class Gamification(Base):
     __tablename__ = "gamification"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # one row per user; the unique index also enables ON CONFLICT upserts
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
 
-    points = Column(Integer, nullable=False, server_default="0")
+    points = Column(Integer, nullable=False, server_default=sa_text("0"))
     badge_level = Column(String, nullable=False, server_default="Newbie")
 
-    user = relationship("User", back_populates="gamification_entries", lazy="selectin")
+    user = relationship("User", back_populates="gamification_entries", lazy="select")
 
 
 # =========================
@@ -242,12 +315,12 @@ class Character(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     asset_key = Column(String(50), nullable=False, unique=True, index=True)
-    cost = Column(Integer, nullable=False, server_default="0")
-    is_active = Column(Boolean, nullable=False, server_default="true")
+    cost = Column(Integer, nullable=False, server_default=sa_text("0"))
+    is_active = Column(Boolean, nullable=False, server_default=sa_text("true"))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    owners = relationship("UserCharacter", back_populates="character", lazy="selectin")
+    owners = relationship("UserCharacter", back_populates="character", lazy="select")
 
 
 # =========================
@@ -257,16 +330,26 @@ class UserCharacter(Base):
     __tablename__ = "user_characters"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # covered by the leading column of uq_user_character
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     character_id = Column(Integer, ForeignKey("characters.id"), nullable=False, index=True)
 
-    is_active = Column(Boolean, nullable=False, server_default="false")
+    is_active = Column(Boolean, nullable=False, server_default=sa_text("false"))
     acquired_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    __table_args__ = (UniqueConstraint("user_id", "character_id", name="uq_user_character"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "character_id", name="uq_user_character"),
+        # set_active's conditional UPDATE and the active-character read only
+        # ever look for the one active row per user.
+        Index(
+            "ix_user_characters_active",
+            "user_id",
+            postgresql_where=sa_text("is_active"),
+        ),
+    )
 
-    user = relationship("User", back_populates="owned_characters", lazy="selectin")
-    character = relationship("Character", back_populates="owners", lazy="selectin")
+    user = relationship("User", back_populates="owned_characters", lazy="select")
+    character = relationship("Character", back_populates="owners", lazy="select")
 
 
 # =========================
@@ -278,20 +361,26 @@ class Reward(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
     points = Column(Integer, nullable=False)
-    is_active = Column(Boolean, nullable=False, server_default="true")
+    is_active = Column(Boolean, nullable=False, server_default=sa_text("true"))
 
-    claims = relationship("RewardClaim", back_populates="reward", lazy="selectin")
+    claims = relationship("RewardClaim", back_populates="reward", lazy="select")
 
 
 class RewardClaim(Base):
     __tablename__ = "reward_claims"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # covered by the leading column of uq_user_reward
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     reward_id = Column(Integer, ForeignKey("rewards.id"), nullable=False, index=True)
     claimed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (UniqueConstraint("user_id", "reward_id", name="uq_user_reward"),)
 
-    user = relationship("User", back_populates="reward_claims", lazy="selectin")
-    reward = relationship("Reward", back_populates="claims", lazy="selectin")
+    user = relationship("User", back_populates="reward_claims", lazy="select")
+    reward = relationship("Reward", back_populates="claims", lazy="select")
+
+
+# Resolve all mappers and relationship strings now, at import time, instead
+# of lazily on the first query so first-request latency stays flat.
+configure_mappers()
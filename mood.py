@@ -1,8 +1,9 @@
-from datetime import datetime
+import threading
+from datetime import date, datetime, time
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import func
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -11,6 +12,18 @@ from auth import get_current_user
 
 router = APIRouter(prefix="/mood", tags=["Mood"])
 
+# Latest mood id per (user_id, utc day). Written on /add, read by /today so
+# the repeat-view case becomes a primary-key get instead of a range scan.
+_today_cache: dict[tuple[int, date], int] = {}
+_today_cache_lock = threading.Lock()
+
+
+def _cache_today_mood(user_id: int, today: date, mood_id: int) -> None:
+    with _today_cache_lock:
+        for key in [k for k in _today_cache if k[1] != today]:
+            del _today_cache[key]
+        _today_cache[(user_id, today)] = mood_id
+
 
 class MoodCreate(BaseModel):
     mood: str
@@ -18,14 +31,13 @@ class MoodCreate(BaseModel):
 
 
 class MoodOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     mood: str
     note: str | None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 @router.post("/add", response_model=MoodOut)
 def add_mood(
@@ -41,6 +53,7 @@ def add_mood(
     db.add(mood_entry)
     db.commit()
     db.refresh(mood_entry)
+    _cache_today_mood(current_user.id, datetime.utcnow().date(), mood_entry.id)
     return mood_entry
 
 
@@ -49,13 +62,15 @@ def list_moods(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    moods = (
-        db.query(Mood)
-        .filter(Mood.user_id == current_user.id)
+    # Project just the response columns; skips ORM instantiation and the
+    # identity-map insert per row.
+    rows = db.execute(
+        select(Mood.id, Mood.mood, Mood.note, Mood.created_at)
+        .where(Mood.user_id == current_user.id)
         .order_by(Mood.created_at.desc())
-        .all()
-    )
-    return moods
+        .limit(100)
+    ).mappings().all()
+    return rows
 
 
 @router.get("/today", response_model=MoodOut)
@@ -65,17 +80,26 @@ def today_mood(
 ):
     today = datetime.utcnow().date()
 
-    mood_entry = (
-        db.query(Mood)
-        .filter(
+    cached_id = _today_cache.get((current_user.id, today))
+    if cached_id is not None:
+        mood_entry = db.get(Mood, cached_id)
+        if mood_entry is not None:
+            return mood_entry
+
+    # Half-open range instead of func.date(created_at) == today so the
+    # predicate stays sargable and can use the (user_id, created_at) index.
+    mood_entry = db.execute(
+        select(Mood)
+        .where(
             Mood.user_id == current_user.id,
-            func.date(Mood.created_at) == today,
+            Mood.created_at >= datetime.combine(today, time.min),
         )
         .order_by(Mood.created_at.desc())
-        .first()
-    )
+        .limit(1)
+    ).scalars().first()
 
     if not mood_entry:
         raise HTTPException(status_code=404, detail="No mood entry for today.")
 
+    _cache_today_mood(current_user.id, today, mood_entry.id)
     return mood_entry
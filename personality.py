@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import desc
+from sqlalchemy import desc, update
 
 from database import get_db
 from models import PersonalityResponse, User, UserProfile
 from auth import get_current_user
+from suggestions import bust_user_context
+from user_profile import bust_ai_profile_cache
 
 router = APIRouter(prefix="/personality", tags=["Personality / Onboarding"])
 
@@ -39,7 +41,17 @@ def submit_personality_test(
     - user.onboarding_completed = True
     """
 
-    if getattr(current_user, "onboarding_completed", False):
+    # Conditional UPDATE doubles as the already-completed check: no row back
+    # means the flag was already true, without a separate SELECT and without
+    # two concurrent submits both passing a read-then-write guard.
+    completed_row = db.execute(
+        update(User)
+        .where(User.id == current_user.id, User.onboarding_completed.is_(False))
+        .values(onboarding_completed=True)
+        .returning(User.id)
+    ).first()
+    if completed_row is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Personality test already completed.",
@@ -59,7 +71,6 @@ def submit_personality_test(
         profile = (
             db.query(UserProfile)
             .filter(UserProfile.user_id == current_user.id)
-            .order_by(desc(UserProfile.id))
             .first()
         )
         if not profile:
@@ -70,13 +81,12 @@ def submit_personality_test(
         profile.mood = payload.q3_answer
         profile.support_topics = payload.q4_answer
 
-        db.add(profile)
-
-        current_user.onboarding_completed = True
-        db.add(current_user)
+        if profile not in db:
+            db.add(profile)
 
         db.commit()
-        db.refresh(current_user)
+        bust_user_context(current_user.id)
+        bust_ai_profile_cache(current_user.id)
 
     except SQLAlchemyError as e:
         db.rollback()
@@ -1,14 +1,46 @@
 # rewards.py
+import threading
+import time
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from database import get_db
 from auth import get_current_user
 from models import Reward, RewardClaim, Gamification, User
+from stats import bust_today_stats
 
 router = APIRouter(prefix="/rewards", tags=["Rewards"])
 
+# Rewards are catalog data that changes via ops, not user traffic; a short
+# TTL cache turns the per-claim Reward lookup into a dict hit.
+_REWARD_TTL_SECONDS = 60.0
+_reward_cache: dict[int, tuple[float, "tuple[int, bool] | None"]] = {}
+_reward_cache_lock = threading.Lock()
+
+
+def _reward_snapshot(db: Session, reward_id: int) -> "tuple[int, bool] | None":
+    """Return (points, is_active) for the reward, or None if unknown."""
+    now = time.monotonic()
+    with _reward_cache_lock:
+        hit = _reward_cache.get(reward_id)
+        if hit is not None and now - hit[0] < _REWARD_TTL_SECONDS:
+            return hit[1]
+
+    row = db.query(Reward.points, Reward.is_active).filter(Reward.id == reward_id).first()
+    if row is None:
+        # Misses stay uncached: the ids come from the client, so caching
+        # them would let junk requests grow the dict without bound — and a
+        # freshly created reward would 404 for a full TTL.
+        return None
+    snap = (int(row.points), bool(row.is_active))
+    with _reward_cache_lock:
+        _reward_cache[reward_id] = (now, snap)
+    return snap
+
 
 class ClaimBody(BaseModel):
     reward_id: int
@@ -20,30 +52,45 @@ def claim_reward(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    reward = db.query(Reward).filter(Reward.id == body.reward_id, Reward.is_active == True).first()
-    if not reward:
+    reward = _reward_snapshot(db, body.reward_id)
+    if reward is None or not reward[1]:
         raise HTTPException(status_code=404, detail="reward_not_found")
+    reward_points = reward[0]
 
-    already = db.query(RewardClaim).filter(
-        RewardClaim.user_id == current_user.id,
-        RewardClaim.reward_id == reward.id
-    ).first()
-    if already:
+    # Atomic claim: the unique (user_id, reward_id) constraint arbitrates
+    # duplicates server-side, replacing the racy SELECT-then-INSERT check.
+    try:
+        claim_id = db.execute(
+            pg_insert(RewardClaim)
+            .values(user_id=current_user.id, reward_id=body.reward_id)
+            .on_conflict_do_nothing(constraint="uq_user_reward")
+            .returning(RewardClaim.id)
+        ).scalar()
+    except IntegrityError as e:
+        db.rollback()
+        # 23503: reward deleted within the cache TTL — drop the stale
+        # snapshot and report it missing, like the suggestion write paths
+        if getattr(getattr(e, "orig", None), "pgcode", None) == "23503":
+            with _reward_cache_lock:
+                _reward_cache.pop(body.reward_id, None)
+            raise HTTPException(status_code=404, detail="reward_not_found")
+        raise
+    if claim_id is None:
+        db.rollback()
         raise HTTPException(status_code=409, detail="already_claimed")
 
     g = db.query(Gamification).filter(Gamification.user_id == current_user.id).first()
     if not g:
         g = Gamification(user_id=current_user.id, points=0)
         db.add(g)
-        db.commit()
-        db.refresh(g)
 
-    g.points += reward.points
-    db.add(RewardClaim(user_id=current_user.id, reward_id=reward.id))
+    g.points = int(g.points or 0) + reward_points
     db.commit()
+    # points moved — invalidate the /stats/today payload for this user
+    bust_today_stats(current_user.id)
 
     return {
-        "points_added": reward.points,
+        "points_added": reward_points,
         "new_points": g.points
     }
 
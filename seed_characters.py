@@ -1,9 +1,12 @@
 # seed_characters.py  (REVIZE)
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+
 from models import Character
 
 # ❗ SADECE SHOP KARAKTERLERİ
-SHOP_CHARACTERS = [
+SHOP_CHARACTERS = (
     {"name": "Uzman Mindy", "asset_key": "uzman", "cost": 40},
     {"name": "Yazar Mindy", "asset_key": "yazar", "cost": 60},
     {"name": "Sporcu Mindy", "asset_key": "sporcu", "cost": 10},
@@ -16,31 +19,39 @@ SHOP_CHARACTERS = [
     {"name": "Dansci Mindy", "asset_key": "dansci", "cost": 40},
     {"name": "Guru Mindy", "asset_key": "guru", "cost": 80},
     {"name": "Sarkici Mindy", "asset_key": "sarkici", "cost": 45},
-]
+)
 
 
-def seed_characters_upsert(db: Session) -> dict:
-    inserted = 0
-    updated = 0
-
-    for c in SHOP_CHARACTERS:
-        existing = db.query(Character).filter(Character.asset_key == c["asset_key"]).first()
-        if existing:
-            changed = False
-            if existing.name != c["name"]:
-                existing.name = c["name"]
-                changed = True
-            if int(existing.cost or 0) != int(c["cost"]):
-                existing.cost = int(c["cost"])
-                changed = True
-            if hasattr(existing, "is_active") and existing.is_active is False:
-                existing.is_active = True
-                changed = True
-            if changed:
-                updated += 1
-        else:
-            db.add(Character(**c))
-            inserted += 1
+def _build_upsert_stmt():
+    stmt = pg_insert(Character).values(list(SHOP_CHARACTERS))
+    return stmt.on_conflict_do_update(
+        index_elements=[Character.asset_key],
+        set_={
+            "name": stmt.excluded.name,
+            "cost": stmt.excluded.cost,
+            "is_active": True,
+        },
+        # xmax = 0 marks freshly inserted rows, letting us keep the
+        # inserted/updated split in the response without extra queries.
+    ).returning(literal_column("(xmax = 0)").label("inserted"))
+
+
+# The catalog is a constant, so the statement can be built once at import
+# time instead of per call.
+_UPSERT_STMT = _build_upsert_stmt()
 
+
+def seed_characters_upsert(db: Session) -> dict:
+    """
+    Single INSERT ... ON CONFLICT (asset_key) DO UPDATE for the whole
+    catalog instead of one SELECT + INSERT/UPDATE per row.
+    """
+    rows = db.execute(_UPSERT_STMT).all()
     db.commit()
-    return {"inserted": inserted, "updated": updated, "total_should_be": len(SHOP_CHARACTERS)}
+
+    inserted = sum(1 for r in rows if r.inserted)
+    return {
+        "inserted": inserted,
+        "updated": len(rows) - inserted,
+        "total_should_be": len(SHOP_CHARACTERS),
+    }
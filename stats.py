@@ -1,16 +1,33 @@
 # stats.py (FULL REVISE - fixes NULL created_at + correct counting)
 
+import threading
+import time as time_mod
+from datetime import date, datetime, time, timedelta
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func, or_, and_, select
 
-from database import get_db
+from database import get_db_ro
 from auth import get_current_user
 from models import User, Suggestion, SuggestionReaction, Gamification
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
+# Dashboards poll /stats/today far more often than the numbers change.
+# Cache the computed payload per user for a short window; write paths that
+# move the counters call bust_today_stats() so fresh activity shows up on
+# the next poll.
+_STATS_TTL_SECONDS = 60.0
+_stats_cache: dict[int, tuple[float, date, dict]] = {}
+_stats_cache_lock = threading.Lock()
+
+
+def bust_today_stats(user_id: int) -> None:
+    with _stats_cache_lock:
+        _stats_cache.pop(user_id, None)
+
 
 class TodayStatsResponse(BaseModel):
     build: str
@@ -23,49 +40,83 @@ class TodayStatsResponse(BaseModel):
 @router.get("/today", response_model=TodayStatsResponse)
 def get_today_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
     user_id = current_user.id
+    today = datetime.utcnow().date()
+
+    with _stats_cache_lock:
+        hit = _stats_cache.get(user_id)
+    if hit is not None:
+        cached_at, cached_day, payload = hit
+        if cached_day == today and time_mod.monotonic() - cached_at < _STATS_TTL_SECONDS:
+            return payload
 
     # ✅ IMPORTANT: Your DB has NULL created_at for suggestions.
-    # We count "today" by Postgres CURRENT_DATE using:
-    #   COALESCE(created_at::date, CURRENT_DATE) = CURRENT_DATE
-    # So old rows with NULL created_at won't break progress.
+    # Legacy NULL rows still count as "today" (the old COALESCE behavior),
+    # but the date match itself is a half-open created_at range so the
+    # (user_id, created_at) indexes can serve it instead of a scan over
+    # date(created_at).
+    today_start = datetime.combine(today, time.min)
+    today_end = today_start + timedelta(days=1)
+
+    def _today(col):
+        return or_(
+            and_(col >= today_start, col < today_end),
+            col.is_(None),
+        )
 
-    suggestions_created = (
-        db.query(func.count(Suggestion.id))
-        .filter(
+    # All three figures in one statement (scalar subqueries) instead of
+    # three serial round-trips.
+    suggestions_sq = (
+        select(func.count(Suggestion.id))
+        .where(
             Suggestion.user_id == user_id,
-            func.coalesce(func.date(Suggestion.created_at), func.current_date()) == func.current_date(),
+            _today(Suggestion.created_at),
         )
-        .scalar()
-        or 0
+        .scalar_subquery()
     )
-
-    likes_given = (
-        db.query(func.count(SuggestionReaction.id))
-        .filter(
+    likes_sq = (
+        select(func.count(SuggestionReaction.id))
+        .where(
             SuggestionReaction.user_id == user_id,
             SuggestionReaction.reaction == "like",
-            func.coalesce(func.date(SuggestionReaction.created_at), func.current_date()) == func.current_date(),
+            _today(SuggestionReaction.created_at),
         )
-        .scalar()
-        or 0
+        .scalar_subquery()
+    )
+    points_sq = (
+        select(Gamification.points)
+        .where(Gamification.user_id == user_id)
+        .limit(1)
+        .scalar_subquery()
     )
 
-    gam = db.query(Gamification).filter(Gamification.user_id == user_id).first()
-    points = int(gam.points) if gam else 0
+    row = db.execute(
+        select(
+            suggestions_sq.label("suggestions_created"),
+            likes_sq.label("likes_given"),
+            func.coalesce(points_sq, 0).label("points"),
+        )
+    ).one()
+
+    suggestions_created = row.suggestions_created or 0
+    likes_given = row.likes_given or 0
+    points = int(row.points)
 
     # If chat activity increments points, keep this proxy
     total_chats = points
 
-    return TodayStatsResponse(
-        build="stats-fix-2025-12-21-03",
-        total_chats=int(total_chats),
-        suggestions_created=int(suggestions_created),
-        likes_given=int(likes_given),
-        points=int(points),
-    )
+    payload = {
+        "build": "stats-fix-2025-12-21-03",
+        "total_chats": int(total_chats),
+        "suggestions_created": int(suggestions_created),
+        "likes_given": int(likes_given),
+        "points": int(points),
+    }
+    with _stats_cache_lock:
+        _stats_cache[user_id] = (time_mod.monotonic(), today, payload)
+    return payload
 
 
 # ✅ main.py import compatibility
@@ -1,19 +1,24 @@
 # suggestions.py (FULL REVIZE + source + AI output cleanup)
 
+import hashlib
 import os
 import re
-import json
 import logging
+import threading
+import time as time_mod
 from typing import List, Optional, Literal, Tuple
 from datetime import date
 
-from fastapi import APIRouter, HTTPException, Depends, Header
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, desc, case
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import func, desc, case, exists, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from database import get_db
+from database import get_db, get_db_ro
 from models import (
     Suggestion,
     SuggestionReaction,
@@ -25,6 +30,7 @@ from models import (
 )
 from auth import get_current_user
 from ai_client import generate_response, AIClientError
+from stats import bust_today_stats
 
 router = APIRouter(prefix="/suggestions", tags=["Crowdsourcing"])
 logger = logging.getLogger(__name__)
@@ -41,8 +47,7 @@ class SuggestionDTO(BaseModel):
     text: str
     source: Optional[str] = None  # user/ai/system
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SuggestionFeedDTO(BaseModel):
@@ -54,8 +59,7 @@ class SuggestionFeedDTO(BaseModel):
     dislikes: int
     is_saved: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ReactionUpsert(BaseModel):
@@ -82,8 +86,7 @@ class CommentDTO(BaseModel):
     user_id: int
     text: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SuggestionDailyDTO(BaseModel):
@@ -95,18 +98,35 @@ class SuggestionDailyDTO(BaseModel):
     dislikes: int
     is_saved: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DailyIngestRequest(BaseModel):
     text: str
 
 
+class BulkIngestRequest(BaseModel):
+    texts: List[str]
+
+
 # ===================== HELPERS =====================
 
 _JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL | re.IGNORECASE)
 
+# _sanitize_text runs on every AI reply and user write; precompiled patterns
+# skip the re-module cache lookup each call makes for inline re.sub.
+_FENCE_HEAD_RE = re.compile(r"^\s*```(?:json)?\s*", re.IGNORECASE)
+_FENCE_TAIL_RE = re.compile(r"\s*```\s*$")
+_MD_HEADING_RE = re.compile(r"^\s*#{1,6}\s*", re.MULTILINE)
+_MD_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_MD_ITALIC_RE = re.compile(r"\*(.*?)\*")
+_MD_BULLET_RE = re.compile(r"^\s*[-•]\s+", re.MULTILINE)
+_EMOJI_RE = re.compile(r"[\U00010000-\U0010FFFF]")
+_MULTI_NEWLINE_RE = re.compile(r"\n{2,}")
+_NEWLINE_RE = re.compile(r"\s*\n\s*")
+_MULTI_SPACE_RE = re.compile(r"[ \t]+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 def _extract_text_from_possible_json(raw: str) -> str:
     """
@@ -127,10 +147,14 @@ def _extract_text_from_possible_json(raw: str) -> str:
     if m:
         s = (m.group(1) or "").strip()
 
-    # json object / array
+    # json object / array — only worth decoding if it plausibly carries a
+    # keyed payload; brace-wrapped text with no colon at all can't be one
+    # and skips the parser entirely.
     if (s.startswith("{") and s.endswith("}")) or (s.startswith("[") and s.endswith("]")):
+        if ":" not in s:
+            return s
         try:
-            obj = json.loads(s)
+            obj = orjson.loads(s)
             if isinstance(obj, dict):
                 for k in ("text", "reply", "message", "output"):
                     v = obj.get(k)
@@ -161,28 +185,31 @@ def _sanitize_text(text: str) -> str:
     t = t.replace("\r\n", "\n").replace("\r", "\n").strip()
 
     # 1) fenced wrappers
-    t = re.sub(r"^\s*```(?:json)?\s*", "", t, flags=re.IGNORECASE)
-    t = re.sub(r"\s*```\s*$", "", t).strip()
+    t = _FENCE_HEAD_RE.sub("", t)
+    t = _FENCE_TAIL_RE.sub("", t).strip()
 
     # 2) remove markdown formatting
-    t = re.sub(r"^\s*#{1,6}\s*", "", t, flags=re.MULTILINE)  # headings
-    t = re.sub(r"\*\*(.*?)\*\*", r"\1", t)                  # **bold**
-    t = re.sub(r"\*(.*?)\*", r"\1", t)                      # *italic*
-    t = re.sub(r"^\s*[-•]\s+", "", t, flags=re.MULTILINE)   # bullets
+    t = _MD_HEADING_RE.sub("", t)           # headings
+    t = _MD_BOLD_RE.sub(r"\1", t)           # **bold**
+    t = _MD_ITALIC_RE.sub(r"\1", t)         # *italic*
+    t = _MD_BULLET_RE.sub("", t)            # bullets
 
-    # 3) remove emojis (basic unicode range)
-    t = re.sub(r"[\U00010000-\U0010FFFF]", "", t)
+    # 3) remove emojis (basic unicode range) — cheap membership test first,
+    # since most stored text is plain BMP characters
+    if any(ord(ch) > 0xFFFF for ch in t):
+        t = _EMOJI_RE.sub("", t)
 
     # 4) collapse newlines into spaces
-    t = re.sub(r"\n{2,}", "\n", t)
-    t = re.sub(r"\s*\n\s*", " ", t).strip()
+    if "\n" in t:
+        t = _MULTI_NEWLINE_RE.sub("\n", t)
+        t = _NEWLINE_RE.sub(" ", t).strip()
 
     # 5) remove quoted wrapper
     if len(t) >= 2 and ((t[0] == '"' and t[-1] == '"') or (t[0] == "'" and t[-1] == "'")):
         t = t[1:-1].strip()
 
     # 6) normalize internal whitespace
-    t = re.sub(r"[ \t]+", " ", t).strip()
+    t = _MULTI_SPACE_RE.sub(" ", t).strip()
 
     return t
 
@@ -197,7 +224,7 @@ def _clamp_to_2_sentences(t: str) -> str:
         return s
 
     # naive sentence split for TR/EN punctuation
-    parts = re.split(r"(?<=[.!?])\s+", s)
+    parts = _SENTENCE_SPLIT_RE.split(s)
     parts = [p.strip() for p in parts if p.strip()]
 
     if len(parts) <= 2:
@@ -208,9 +235,28 @@ def _clamp_to_2_sentences(t: str) -> str:
 
 
 def _validate_text(text: str) -> str:
-    t = _sanitize_text(text)
-    t = _clamp_to_2_sentences(t)
+    # Reject blank input before the regex-heavy sanitize/clamp pipeline runs;
+    # this is on every write path, so the cheap check goes first.
+    t = text.strip() if text else ""
+    if not t:
+        raise HTTPException(status_code=400, detail="Text cannot be empty.")
 
+    # Fast path: short plain ASCII with nothing the sanitize pipeline would
+    # rewrite and no mid-string sentence boundary for the clamp to cut —
+    # the common case for ordinary comments and tips.
+    if (
+        len(t) <= 500
+        and t.isascii()
+        and "  " not in t
+        and not t.startswith(("-", "•"))
+        and not any(c in t for c in "`{}[]\"'\r\n\t*#")
+        and ". " not in t
+        and "! " not in t
+        and "? " not in t
+    ):
+        return t
+
+    t = _clamp_to_2_sentences(_sanitize_text(t))
     if not t:
         raise HTTPException(status_code=400, detail="Text cannot be empty.")
     if len(t) > 500:
@@ -218,88 +264,130 @@ def _validate_text(text: str) -> str:
     return t
 
 
-def _likes_dislikes(db: Session, suggestion_id: int) -> Tuple[int, int]:
-    likes = (
-        db.query(func.count(SuggestionReaction.id))
-        .filter(
-            SuggestionReaction.suggestion_id == suggestion_id,
-            SuggestionReaction.reaction == "like",
-        )
-        .scalar()
-        or 0
-    )
-    dislikes = (
-        db.query(func.count(SuggestionReaction.id))
-        .filter(
-            SuggestionReaction.suggestion_id == suggestion_id,
-            SuggestionReaction.reaction == "dislike",
+def _recount_reactions(db: Session, suggestion_id: int) -> None:
+    """
+    Refresh the denormalized like/dislike counters from the reaction rows.
+    Runs inside the caller's transaction; also self-heals rows that predate
+    the counter columns.
+    """
+    db.execute(
+        Suggestion.__table__.update()
+        .where(Suggestion.id == suggestion_id)
+        .values(
+            likes_count=select(func.count(SuggestionReaction.id))
+            .where(
+                SuggestionReaction.suggestion_id == suggestion_id,
+                SuggestionReaction.reaction == "like",
+            )
+            .scalar_subquery(),
+            dislikes_count=select(func.count(SuggestionReaction.id))
+            .where(
+                SuggestionReaction.suggestion_id == suggestion_id,
+                SuggestionReaction.reaction == "dislike",
+            )
+            .scalar_subquery(),
         )
-        .scalar()
-        or 0
     )
-    return int(likes), int(dislikes)
 
 
-def _is_saved(db: Session, suggestion_id: int, user_id: int) -> bool:
-    return (
-        db.query(SuggestionSave)
-        .filter(
-            SuggestionSave.suggestion_id == suggestion_id,
-            SuggestionSave.user_id == user_id,
+def _is_saved_flag(db: Session, suggestion_id: int, user_id: int) -> bool:
+    # lambda_stmt: the select() is constructed once and reused by statement
+    # identity; only the closed-over ids are re-bound per call. These probes
+    # run on every daily/react/save hit, so skipping expression construction
+    # is a measurable CPU save.
+    stmt = lambda_stmt(
+        lambda: select(
+            exists().where(
+                SuggestionSave.suggestion_id == suggestion_id,
+                SuggestionSave.user_id == user_id,
+            )
         )
-        .first()
-        is not None
     )
+    return bool(db.execute(stmt).scalar())
 
 
-def _build_user_context(db: Session, user_id: int) -> str:
+def _is_fk_violation(exc: IntegrityError) -> bool:
+    # psycopg2 exposes the SQLSTATE on the driver exception; 23503 is
+    # foreign_key_violation, i.e. the referenced suggestion does not exist.
+    return getattr(getattr(exc, "orig", None), "pgcode", None) == "23503"
+
+
+# Personality answers change rarely (once at onboarding, occasionally on
+# retake) but are re-read on every AI generation. Cache the latest answers
+# per user for a short window; personality.py calls bust_user_context() on
+# submit so a retake shows up immediately in-process.
+_PERSONALITY_TTL_SECONDS = 300.0
+_personality_cache: "dict[int, tuple[float, tuple[str, str, str, str] | None]]" = {}
+_personality_cache_lock = threading.Lock()
+
+
+def bust_user_context(user_id: int) -> None:
+    with _personality_cache_lock:
+        _personality_cache.pop(user_id, None)
+
+
+def _latest_personality(db: Session, user_id: int) -> "tuple[str, str, str, str] | None":
+    with _personality_cache_lock:
+        hit = _personality_cache.get(user_id)
+    if hit is not None and time_mod.monotonic() - hit[0] < _PERSONALITY_TTL_SECONDS:
+        return hit[1]
+
     p = (
         db.query(PersonalityResponse)
         .filter(PersonalityResponse.user_id == user_id)
         .order_by(desc(PersonalityResponse.id))
         .first()
     )
+    answers = (p.q1_answer, p.q2_answer, p.q3_answer, p.q4_answer) if p else None
+    with _personality_cache_lock:
+        _personality_cache[user_id] = (time_mod.monotonic(), answers)
+    return answers
+
+
+# The instruction block and the unknown-profile prompt never change, so
+# build them once at import instead of re-concatenating per call.
+_AI_INSTRUCTION = (
+    "INSTRUCTION:\n"
+    "- Speak Turkish.\n"
+    "- Produce ONE short daily suggestion (1-2 sentences max).\n"
+    "- Actionable, kind, practical.\n"
+    "- Do NOT use markdown headings/bullets.\n"
+    "- Do NOT use emojis.\n"
+    "- No medical diagnosis.\n"
+)
 
-    instruction = (
-        "INSTRUCTION:\n"
-        "- Speak Turkish.\n"
-        "- Produce ONE short daily suggestion (1-2 sentences max).\n"
-        "- Actionable, kind, practical.\n"
-        "- Do NOT use markdown headings/bullets.\n"
-        "- Do NOT use emojis.\n"
-        "- No medical diagnosis.\n"
-    )
+_UNKNOWN_PROFILE_CONTEXT = (
+    "USER PROFILE:\n"
+    "- AgeRange: Unknown\n"
+    "- Gender: Unknown\n"
+    "- CurrentMood: Unknown\n"
+    "- SupportTopics: General wellbeing\n\n"
+    + _AI_INSTRUCTION
+)
 
-    if not p:
-        return (
-            "USER PROFILE:\n"
-            "- AgeRange: Unknown\n"
-            "- Gender: Unknown\n"
-            "- CurrentMood: Unknown\n"
-            "- SupportTopics: General wellbeing\n\n"
-            + instruction
-        )
 
-    topics = (p.q4_answer or "").strip() or "General wellbeing"
+def _build_user_context(db: Session, user_id: int) -> str:
+    answers = _latest_personality(db, user_id)
+
+    if not answers:
+        return _UNKNOWN_PROFILE_CONTEXT
+
+    q1, q2, q3, q4 = answers
+    topics = (q4 or "").strip() or "General wellbeing"
     return (
         "USER PROFILE:\n"
-        f"- AgeRange: {p.q1_answer}\n"
-        f"- Gender: {p.q2_answer}\n"
-        f"- CurrentMood: {p.q3_answer}\n"
+        f"- AgeRange: {q1}\n"
+        f"- Gender: {q2}\n"
+        f"- CurrentMood: {q3}\n"
         f"- SupportTopics: {topics}\n\n"
-        + instruction
+        + _AI_INSTRUCTION
     )
 
 
 def _build_user_data(db: Session, user_id: int) -> dict:
-    p = (
-        db.query(PersonalityResponse)
-        .filter(PersonalityResponse.user_id == user_id)
-        .order_by(desc(PersonalityResponse.id))
-        .first()
-    )
+    answers = _latest_personality(db, user_id)
 
-    if not p:
+    if not answers:
         return {
             "age": "unknown",
             "gender": "unknown",
@@ -308,26 +396,36 @@ def _build_user_data(db: Session, user_id: int) -> dict:
             "location": "unknown",
         }
 
-    topics = (p.q4_answer or "").strip() or "General wellbeing"
+    q1, q2, q3, q4 = answers
+    topics = (q4 or "").strip() or "General wellbeing"
     return {
-        "age": p.q1_answer or "unknown",
-        "gender": p.q2_answer or "unknown",
-        "mood": p.q3_answer or "unknown",
+        "age": q1 or "unknown",
+        "gender": q2 or "unknown",
+        "mood": q3 or "unknown",
         "supportTopics": topics,
         "location": "unknown",
     }
 
 
 async def _generate_ai_suggestion_text(db: Session, user_id: int) -> str:
-    user_data = _build_user_data(db, user_id)
+    # /generate runs on the event loop; the context builders may hit the DB
+    # on a personality-cache miss, so push them to the thread pool instead
+    # of blocking the loop with sync I/O.
+    user_data = await run_in_threadpool(_build_user_data, db, user_id)
+    user_context = await run_in_threadpool(_build_user_context, db, user_id)
     prompt = "Kullanıcının profil bilgilerine göre bugün için TEK bir öneri üret. Kısa olsun (1-2 cümle)."
 
+    # The LLM round trip takes seconds; give the pooled connection back for
+    # that wait. The Session stays usable and checks a fresh connection out
+    # on its next use after the await.
+    db.close()
+
     try:
         reply = await generate_response(
             message=prompt,
             history=[],
             user_data=user_data,
-            user_context=_build_user_context(db, user_id),
+            user_context=user_context,
         )
     except AIClientError as e:
         raise HTTPException(status_code=502, detail=f"AIClientError: {str(e)}")
@@ -335,6 +433,49 @@ async def _generate_ai_suggestion_text(db: Session, user_id: int) -> str:
     return _validate_text(reply)
 
 
+# Approved-tip id pool, refreshed once per day: the deterministic pick then
+# costs an O(1) index into the cached ids plus one PK fetch, instead of
+# materializing the whole approved pool per request.
+_fallback_pool_cache: "tuple[date, tuple[int, ...]] | None" = None
+_fallback_pool_lock = threading.Lock()
+
+# /daily serves the same global tip to everyone all day, so remember the
+# day -> suggestion_id mapping per process and skip the JOIN on repeat hits.
+# ingest-daily repoints the entry when it sets today's tip. This is the
+# in-process stand-in for the Redis cache the dashboards would otherwise
+# need — per-user bits (is_saved) stay uncached.
+_daily_tip_cache: "tuple[date, int] | None" = None
+_daily_tip_lock = threading.Lock()
+
+
+def _fallback_pool_ids(db: Session, today: date) -> "tuple[int, ...]":
+    global _fallback_pool_cache
+
+    with _fallback_pool_lock:
+        if _fallback_pool_cache is not None and _fallback_pool_cache[0] == today:
+            return _fallback_pool_cache[1]
+
+    ids = tuple(
+        db.execute(
+            select(Suggestion.id)
+            .where(Suggestion.is_approved.is_(True), Suggestion.source.in_(("system", "ai")))
+            .order_by(Suggestion.id.asc())
+        ).scalars()
+    )
+    if not ids:
+        ids = tuple(
+            db.execute(
+                select(Suggestion.id)
+                .where(Suggestion.is_approved.is_(True))
+                .order_by(Suggestion.id.asc())
+            ).scalars()
+        )
+
+    with _fallback_pool_lock:
+        _fallback_pool_cache = (today, ids)
+    return ids
+
+
 def _get_fallback_global_tip(db: Session) -> Suggestion:
     """
     Fallback daily tip:
@@ -342,24 +483,47 @@ def _get_fallback_global_tip(db: Session) -> Suggestion:
     - else any approved
     Deterministic: day index
     """
-    base_q = db.query(Suggestion).filter(Suggestion.is_approved.is_(True))
+    today = date.today()
+    ids = _fallback_pool_ids(db, today)
+    if not ids:
+        raise HTTPException(status_code=404, detail="No suggestions available.")
 
-    preferred: List[Suggestion] = []
-    try:
-        preferred = (
-            base_q.filter(Suggestion.source.in_(["system", "ai"]))  # type: ignore[attr-defined]
-            .order_by(Suggestion.id.asc())
-            .all()
-        )
-    except Exception:
-        preferred = []
+    tip = db.get(Suggestion, ids[today.toordinal() % len(ids)])
+    if tip is None:
+        # Cached id was deleted meanwhile; rebuild the pool once.
+        with _fallback_pool_lock:
+            global _fallback_pool_cache
+            _fallback_pool_cache = None
+        ids = _fallback_pool_ids(db, today)
+        if not ids:
+            raise HTTPException(status_code=404, detail="No suggestions available.")
+        tip = db.get(Suggestion, ids[today.toordinal() % len(ids)])
+        if tip is None:
+            raise HTTPException(status_code=404, detail="No suggestions available.")
 
-    pool = preferred if preferred else base_q.order_by(Suggestion.id.asc()).all()
-    if not pool:
-        raise HTTPException(status_code=404, detail="No suggestions available.")
+    return tip
 
-    idx = date.today().toordinal() % len(pool)
-    return pool[idx]
+
+_REVALIDATE_CACHE_CONTROL = "private, max-age=30, stale-while-revalidate=120"
+
+
+def _set_revalidation_headers(request: Request, response: Response, payload) -> None:
+    """
+    Content-derived ETag + short Cache-Control for the read-mostly feed/daily
+    payloads. A matching If-None-Match short-circuits into an empty 304
+    (Starlette strips the body for that status), saving serialization and
+    bandwidth; responses are per-user (is_saved), so caching stays private
+    and varies on the auth header.
+    """
+    etag = '"%s"' % hashlib.md5(orjson.dumps(payload)).hexdigest()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _REVALIDATE_CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+    if request.headers.get("if-none-match") == etag:
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
 
 
 # ===================== ROUTES =====================
@@ -368,62 +532,58 @@ def _get_fallback_global_tip(db: Session) -> Suggestion:
 @router.get("", response_model=List[SuggestionFeedDTO], include_in_schema=False)
 @router.get("/", response_model=List[SuggestionFeedDTO], include_in_schema=False)
 def feed_suggestions(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_db_ro),
     current_user: User = Depends(get_current_user),
 ):
     """
     Community feed: only user suggestions (source='user')
     """
-    agg = (
-        db.query(
-            SuggestionReaction.suggestion_id.label("sid"),
-            func.sum(case((SuggestionReaction.reaction == "like", 1), else_=0)).label("likes"),
-            func.sum(case((SuggestionReaction.reaction == "dislike", 1), else_=0)).label("dislikes"),
-        )
-        .group_by(SuggestionReaction.suggestion_id)
-        .subquery()
-    )
-
+    # The GROUP BY over the whole reaction table is gone: the feed reads the
+    # denormalized likes/dislikes counters straight off each suggestion row
+    # and only joins the viewer's saves for the is_saved flag. Core select()
+    # + .mappings() keeps the 200-row page out of the ORM entirely — plain
+    # dict rows, no identity-map bookkeeping (same shape as mood /list).
     saved = (
-        db.query(SuggestionSave.suggestion_id.label("sid"))
-        .filter(SuggestionSave.user_id == current_user.id)
+        select(SuggestionSave.suggestion_id.label("sid"))
+        .where(SuggestionSave.user_id == current_user.id)
         .subquery()
     )
 
-    q = (
-        db.query(
+    stmt = (
+        select(
             Suggestion.id,
             Suggestion.user_id,
             Suggestion.text,
             Suggestion.source,  # type: ignore[attr-defined]
-            func.coalesce(agg.c.likes, 0).label("likes"),
-            func.coalesce(agg.c.dislikes, 0).label("dislikes"),
+            Suggestion.likes_count.label("likes"),
+            Suggestion.dislikes_count.label("dislikes"),
             case((saved.c.sid.isnot(None), True), else_=False).label("is_saved"),
         )
-        .outerjoin(agg, agg.c.sid == Suggestion.id)
         .outerjoin(saved, saved.c.sid == Suggestion.id)
-        .filter(Suggestion.is_approved.is_(True))
+        .where(Suggestion.is_approved.is_(True), Suggestion.source == "user")
+        .order_by(desc(Suggestion.created_at))
+        .limit(200)
     )
+    if before_id is not None:
+        stmt = stmt.where(Suggestion.id < before_id)
 
-    try:
-        q = q.filter(Suggestion.source == "user")  # type: ignore[attr-defined]
-    except Exception:
-        pass
-
-    rows = q.order_by(desc(Suggestion.created_at)).limit(200).all()
-
-    return [
+    payload = [
         {
-            "id": r.id,
-            "user_id": r.user_id,
-            "text": r.text,
-            "source": getattr(r, "source", None),
-            "likes": int(r.likes or 0),
-            "dislikes": int(r.dislikes or 0),
-            "is_saved": bool(r.is_saved),
+            "id": r["id"],
+            "user_id": r["user_id"],
+            "text": r["text"],
+            "source": r["source"],
+            "likes": int(r["likes"] or 0),
+            "dislikes": int(r["dislikes"] or 0),
+            "is_saved": bool(r["is_saved"]),
         }
-        for r in rows
+        for r in db.execute(stmt).mappings()
     ]
+    _set_revalidation_headers(request, response, payload)
+    return payload
 
 
 @router.post("/ingest-daily", status_code=200)
@@ -452,7 +612,6 @@ def ingest_daily_suggestion(
     try:
         db.add(suggestion)
         db.commit()
-        db.refresh(suggestion)
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error while saving daily suggestion.")
@@ -464,32 +623,84 @@ def ingest_daily_suggestion(
         else:
             db.add(GlobalDailySuggestion(day=today, suggestion_id=suggestion.id))
         db.commit()
+        global _daily_tip_cache
+        with _daily_tip_lock:
+            _daily_tip_cache = (today, suggestion.id)
     except SQLAlchemyError:
         db.rollback()
 
     return {"status": "ok", "day": str(today), "suggestion_id": suggestion.id}
 
 
+@router.post("/ingest-bulk", status_code=200)
+def ingest_bulk_suggestions(
+    payload: BulkIngestRequest,
+    db: Session = Depends(get_db),
+    x_api_key: str = Header(default="", alias="X-API-KEY"),
+):
+    """
+    Admin/n8n bulk import: a single multi-row INSERT (and a single commit/
+    fsync) for the whole batch instead of one transaction per tip.
+    """
+    expected = (os.getenv("DAILY_INGEST_KEY") or "").strip()
+    if not expected:
+        raise HTTPException(status_code=500, detail="DAILY_INGEST_KEY is not configured on server.")
+    if x_api_key != expected:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    rows = [
+        {"user_id": None, "text": _validate_text(t), "is_approved": True, "source": "system"}
+        for t in payload.texts
+    ]
+    if not rows:
+        return {"inserted": 0}
+
+    try:
+        db.execute(Suggestion.__table__.insert(), rows)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while bulk-saving suggestions.")
+
+    return {"inserted": len(rows)}
+
+
 @router.get("/daily", response_model=SuggestionDailyDTO)
 def get_daily_suggestion(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_ro),
     current_user: User = Depends(get_current_user),
 ):
+    global _daily_tip_cache
     today = date.today()
 
-    row = db.query(GlobalDailySuggestion).filter(GlobalDailySuggestion.day == today).first()
     tip: Optional[Suggestion] = None
-
-    if row:
-        tip = db.query(Suggestion).filter(Suggestion.id == row.suggestion_id).first()
+    with _daily_tip_lock:
+        cached = _daily_tip_cache
+    if cached is not None and cached[0] == today:
+        tip = db.get(Suggestion, cached[1])
+
+    if tip is None:
+        # One JOIN resolves today's mapping and the tip row together instead
+        # of chaining two SELECTs.
+        tip = (
+            db.query(Suggestion)
+            .join(GlobalDailySuggestion, GlobalDailySuggestion.suggestion_id == Suggestion.id)
+            .filter(GlobalDailySuggestion.day == today)
+            .first()
+        )
+        if tip is not None:
+            with _daily_tip_lock:
+                _daily_tip_cache = (today, tip.id)
 
     if not tip:
         tip = _get_fallback_global_tip(db)
 
-    likes, dislikes = _likes_dislikes(db, tip.id)
-    saved = _is_saved(db, tip.id, current_user.id)
+    likes, dislikes = int(tip.likes_count or 0), int(tip.dislikes_count or 0)
+    saved = _is_saved_flag(db, tip.id, current_user.id)
 
-    return {
+    payload = {
         "id": tip.id,
         "user_id": tip.user_id,
         "text": tip.text,
@@ -498,6 +709,8 @@ def get_daily_suggestion(
         "dislikes": dislikes,
         "is_saved": saved,
     }
+    _set_revalidation_headers(request, response, payload)
+    return payload
 
 
 @router.post("/", response_model=SuggestionDTO, status_code=201)
@@ -521,11 +734,11 @@ def create_suggestion(
     try:
         db.add(suggestion)
         db.commit()
-        db.refresh(suggestion)
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error while creating suggestion.")
 
+    bust_today_stats(current_user.id)
     return suggestion
 
 
@@ -551,8 +764,7 @@ async def generate_daily_ai_suggestion(
             suggestion = Suggestion(user_id=current_user.id, text=text, is_approved=True)
 
         db.add(suggestion)
-        db.commit()
-        db.refresh(suggestion)
+        await run_in_threadpool(db.commit)
         return suggestion
 
     except Exception as e:
@@ -565,33 +777,27 @@ async def generate_daily_ai_suggestion(
         if debug:
             raise HTTPException(status_code=502, detail=f"AI generate failed: {str(e)}")
 
-        return _get_fallback_global_tip(db)
+        return await run_in_threadpool(_get_fallback_global_tip, db)
 
 
 @router.get("/saved/me", response_model=List[SuggestionDTO])
 def list_my_saved(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
     current_user: User = Depends(get_current_user),
 ):
-    saved_rows = (
-        db.query(SuggestionSave)
+    # One JOIN ordered by the save timestamp replaces the old two-step
+    # (fetch saves, then re-order suggestions with a 100-branch CASE).
+    # raiseload: the DTO only reads columns, so any relationship touch is a
+    # lazy-load regression — fail loudly instead of issuing N+1 queries.
+    return (
+        db.query(Suggestion)
+        .options(raiseload("*"))
+        .join(SuggestionSave, SuggestionSave.suggestion_id == Suggestion.id)
         .filter(SuggestionSave.user_id == current_user.id)
         .order_by(desc(SuggestionSave.created_at))
         .limit(100)
         .all()
     )
-    if not saved_rows:
-        return []
-
-    suggestion_ids = [r.suggestion_id for r in saved_rows]
-    ordering = case({sid: i for i, sid in enumerate(suggestion_ids)}, value=Suggestion.id)
-
-    return (
-        db.query(Suggestion)
-        .filter(Suggestion.id.in_(suggestion_ids))
-        .order_by(ordering)
-        .all()
-    )
 
 
 @router.post("/react", status_code=200)
@@ -600,35 +806,33 @@ def react_to_suggestion(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    suggestion = db.query(Suggestion).filter(Suggestion.id == payload.suggestion_id).first()
-    if not suggestion:
-        raise HTTPException(status_code=404, detail="Suggestion not found.")
-
-    existing = (
-        db.query(SuggestionReaction)
-        .filter(
-            SuggestionReaction.suggestion_id == payload.suggestion_id,
-            SuggestionReaction.user_id == current_user.id,
-        )
-        .first()
-    )
-
     try:
-        if existing:
-            existing.reaction = payload.reaction
-        else:
-            db.add(
-                SuggestionReaction(
-                    suggestion_id=payload.suggestion_id,
-                    user_id=current_user.id,
-                    reaction=payload.reaction,
-                )
+        # One atomic statement instead of SELECT-then-INSERT/UPDATE; the
+        # unique (suggestion_id, user_id) constraint arbitrates, and the FK
+        # on suggestion_id doubles as the 404 guard (no pre-SELECT).
+        ins = pg_insert(SuggestionReaction).values(
+            suggestion_id=payload.suggestion_id,
+            user_id=current_user.id,
+            reaction=payload.reaction,
+        )
+        db.execute(
+            ins.on_conflict_do_update(
+                constraint="uq_reaction_suggestion_user",
+                set_={"reaction": ins.excluded.reaction},
             )
+        )
+        _recount_reactions(db, payload.suggestion_id)
         db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if _is_fk_violation(e):
+            raise HTTPException(status_code=404, detail="Suggestion not found.")
+        raise HTTPException(status_code=500, detail="Database error while saving reaction.")
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error while saving reaction.")
 
+    bust_today_stats(current_user.id)
     return {"status": "ok"}
 
 
@@ -638,28 +842,33 @@ def toggle_save_suggestion(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    suggestion = db.query(Suggestion).filter(Suggestion.id == payload.suggestion_id).first()
-    if not suggestion:
-        raise HTTPException(status_code=404, detail="Suggestion not found.")
-
-    existing = (
-        db.query(SuggestionSave)
-        .filter(
-            SuggestionSave.suggestion_id == payload.suggestion_id,
-            SuggestionSave.user_id == current_user.id,
-        )
-        .first()
-    )
-
     try:
-        if existing:
-            db.delete(existing)
-            db.commit()
-            return {"status": "ok", "saved": False}
-        else:
-            db.add(SuggestionSave(suggestion_id=payload.suggestion_id, user_id=current_user.id))
+        # Insert-first toggle: ON CONFLICT DO NOTHING + RETURNING tells us in
+        # one atomic round-trip whether the save existed, instead of the old
+        # SELECT-then-INSERT/DELETE pair.
+        inserted_id = db.execute(
+            pg_insert(SuggestionSave)
+            .values(suggestion_id=payload.suggestion_id, user_id=current_user.id)
+            .on_conflict_do_nothing(constraint="uq_save_suggestion_user")
+            .returning(SuggestionSave.id)
+        ).scalar()
+
+        if inserted_id is not None:
             db.commit()
             return {"status": "ok", "saved": True}
+
+        # Already saved -> toggle off.
+        db.query(SuggestionSave).filter(
+            SuggestionSave.suggestion_id == payload.suggestion_id,
+            SuggestionSave.user_id == current_user.id,
+        ).delete(synchronize_session=False)
+        db.commit()
+        return {"status": "ok", "saved": False}
+    except IntegrityError as e:
+        db.rollback()
+        if _is_fk_violation(e):
+            raise HTTPException(status_code=404, detail="Suggestion not found.")
+        raise HTTPException(status_code=500, detail="Database error while toggling save.")
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error while toggling save.")
@@ -671,17 +880,22 @@ def add_comment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    suggestion = db.query(Suggestion).filter(Suggestion.id == payload.suggestion_id).first()
-    if not suggestion:
-        raise HTTPException(status_code=404, detail="Suggestion not found.")
-
     text = _validate_text(payload.text)
     comment = SuggestionComment(suggestion_id=payload.suggestion_id, user_id=current_user.id, text=text)
 
     try:
         db.add(comment)
+        db.execute(
+            Suggestion.__table__.update()
+            .where(Suggestion.id == payload.suggestion_id)
+            .values(comments_count=Suggestion.comments_count + 1)
+        )
         db.commit()
-        db.refresh(comment)
+    except IntegrityError as e:
+        db.rollback()
+        if _is_fk_violation(e):
+            raise HTTPException(status_code=404, detail="Suggestion not found.")
+        raise HTTPException(status_code=500, detail="Database error while creating comment.")
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error while creating comment.")
@@ -692,28 +906,36 @@ def add_comment(
 @router.get("/comment/{suggestion_id}", response_model=List[CommentDTO])
 def list_comments(
     suggestion_id: int,
-    db: Session = Depends(get_db),
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_db_ro),
     current_user: User = Depends(get_current_user),
 ):
-    return (
+    # Keyset pagination: pass the smallest id of the previous page as
+    # before_id to fetch the next one. ids are serial, so id order tracks
+    # created_at order and the probe stays O(log N) at any depth — no
+    # OFFSET scans.
+    q = (
         db.query(SuggestionComment)
+        .options(raiseload("*"))
         .filter(SuggestionComment.suggestion_id == suggestion_id)
-        .order_by(desc(SuggestionComment.created_at))
-        .limit(100)
-        .all()
     )
+    if before_id is not None:
+        q = q.filter(SuggestionComment.id < before_id)
+    return q.order_by(desc(SuggestionComment.created_at)).limit(100).all()
 
 
 @router.get("/{user_id}", response_model=List[SuggestionDTO])
 def list_user_suggestions(
     user_id: int,
-    db: Session = Depends(get_db),
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_db_ro),
     current_user: User = Depends(get_current_user),
 ):
-    return (
+    q = (
         db.query(Suggestion)
+        .options(raiseload("*"))
         .filter(Suggestion.user_id == user_id, Suggestion.is_approved.is_(True))
-        .order_by(desc(Suggestion.created_at))
-        .limit(50)
-        .all()
     )
+    if before_id is not None:
+        q = q.filter(Suggestion.id < before_id)
+    return q.order_by(desc(Suggestion.created_at)).limit(50).all()
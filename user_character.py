@@ -2,13 +2,21 @@
 print("USER_CHARACTER ROUTER LOADED")
 
 # user_character.py
+import threading
+import time as time_mod
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from database import get_db
 from auth import get_current_user
 from models import User, Gamification, UserCharacter, Character  # örnek ilişkiler
+from stats import bust_today_stats
 
 router = APIRouter(prefix="/user/characters", tags=["Characters"])
 
@@ -24,30 +32,65 @@ class BuyBody(BaseModel):
 class ActiveBody(BaseModel):
     character_id: int
 
+
+# The character screen polls this aggregate far more often than purchases or
+# activations change it. Cache the payload per user for a short window (same
+# in-process pattern as the stats cache); the two write endpoints bust the
+# entry so their own response is rebuilt fresh.
+_CHARS_TTL_SECONDS = 300.0
+_chars_cache: dict[int, tuple[float, dict]] = {}
+_chars_cache_lock = threading.Lock()
+
+
+def _bust_chars_cache(user_id: int) -> None:
+    with _chars_cache_lock:
+        _chars_cache.pop(user_id, None)
+
 @router.get("", response_model=UserCharactersResponse)
 def get_user_characters(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # points
-    g = db.query(Gamification).filter(Gamification.user_id == current_user.id).first()
-    points = int(g.points) if g else 0
-
-    rows = db.query(UserCharacter).filter(UserCharacter.user_id == current_user.id).all()
-    owned_ids = [r.character_id for r in rows]
-    active_id = next((r.character_id for r in rows if r.is_active), None)
-
+    with _chars_cache_lock:
+        hit = _chars_cache.get(current_user.id)
+    if hit is not None and time_mod.monotonic() - hit[0] < _CHARS_TTL_SECONDS:
+        return ORJSONResponse(hit[1])
+
+    # Core select()s: the handler only needs scalar columns, so skip ORM
+    # entity hydration entirely.
+    points = db.execute(
+        select(Gamification.points).where(Gamification.user_id == current_user.id)
+    ).scalar()
+    points = int(points) if points is not None else 0
+
+    # One JOIN brings the asset_key along with the ownership rows instead of
+    # a follow-up Character lookup for the active one.
+    rows = db.execute(
+        select(UserCharacter.character_id, UserCharacter.is_active, Character.asset_key)
+        .outerjoin(Character, Character.id == UserCharacter.character_id)
+        .where(UserCharacter.user_id == current_user.id)
+    ).all()
+    owned_ids = []
+    active_id = None
     asset_key = None
-    if active_id:
-        c = db.query(Character).filter(Character.id == active_id).first()
-        asset_key = c.asset_key if c else None
+    for r in rows:
+        owned_ids.append(r.character_id)
+        if r.is_active:
+            active_id = r.character_id
+            asset_key = r.asset_key
 
-    return {
+    payload = {
         "points": points,
         "owned_character_ids": owned_ids,
         "active_character_id": active_id,
         "asset_key": asset_key,
     }
+    with _chars_cache_lock:
+        _chars_cache[current_user.id] = (time_mod.monotonic(), payload)
+    # Every field is server-derived and already DTO-shaped, so returning a
+    # Response skips the per-request Pydantic re-validation pass;
+    # response_model stays for the OpenAPI schema.
+    return ORJSONResponse(payload)
 
 @router.post("/buy", response_model=UserCharactersResponse)
 def buy_character(
@@ -55,38 +98,53 @@ def buy_character(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    char = db.query(Character).filter(Character.id == body.character_id).first()
-    if not char:
-        raise HTTPException(status_code=404, detail="character_not_found")
-
-    g = db.query(Gamification).filter(Gamification.user_id == current_user.id).order_by(Gamification.id.desc()).first()
-    if not g:
-        g = Gamification(user_id=current_user.id, points=0, badge_level="Newbie")
-        db.add(g)
-        db.commit()
-        db.refresh(g)
-
-    if int(g.points) < int(char.cost):
-        raise HTTPException(status_code=400, detail="insufficient_points")
-
-    already = db.query(UserCharacter).filter(
-        UserCharacter.user_id == current_user.id,
-        UserCharacter.character_id == body.character_id
-    ).first()
-    if already:
+    # Eski akış ~6 sorguydu (karakter, gamification, sahiplik, iki yazma);
+    # şimdi iki atomik statement: sahipliği ON CONFLICT ile dene, sonra
+    # puanı koşullu UPDATE ile düş — yarış yok, fazladan SELECT yok.
+    try:
+        inserted = db.execute(
+            pg_insert(UserCharacter)
+            .values(user_id=current_user.id, character_id=body.character_id, is_active=False)
+            .on_conflict_do_nothing(constraint="uq_user_character")
+            .returning(UserCharacter.id)
+        ).scalar()
+    except IntegrityError as e:
+        db.rollback()
+        # 23503: character_id FK'si yok -> 404 (pre-SELECT yerine)
+        if getattr(getattr(e, "orig", None), "pgcode", None) == "23503":
+            raise HTTPException(status_code=404, detail="character_not_found")
+        raise
+
+    if inserted is None:
+        # zaten sahip; hiçbir şey değişmedi
+        db.rollback()
         return get_user_characters(db, current_user)
 
-    # ✅ 1) puanı düş
-    g.points = int(g.points) - int(char.cost)
-    db.add(g)
+    cost_sq = select(Character.cost).where(Character.id == body.character_id).scalar_subquery()
+    paid = db.execute(
+        update(Gamification)
+        .where(Gamification.user_id == current_user.id, Gamification.points >= cost_sq)
+        .values(points=Gamification.points - cost_sq)
+        .returning(Gamification.points)
+    ).first()
 
-    # ✅ 2) satın alımı yaz
-    db.add(UserCharacter(user_id=current_user.id, character_id=body.character_id, is_active=False))
+    if paid is None:
+        # puan yetmedi ya da gamification satırı hiç yoktu; satın alım geri
+        # alınır, satır yoksa sıfır puanla açılır.
+        db.rollback()
+        db.execute(
+            pg_insert(Gamification)
+            .values(user_id=current_user.id)
+            .on_conflict_do_nothing(index_elements=[Gamification.user_id])
+        )
+        db.commit()
+        raise HTTPException(status_code=400, detail="insufficient_points")
 
-    # ✅ 3) commit + refresh
     db.commit()
-    db.refresh(g)
 
+    _bust_chars_cache(current_user.id)
+    # puan düştü — /stats/today cache'i de tazelensin
+    bust_today_stats(current_user.id)
     return get_user_characters(db, current_user)
 
 
@@ -96,17 +154,32 @@ def set_active_character(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    owned = db.query(UserCharacter).filter(
-        UserCharacter.user_id == current_user.id,
-        UserCharacter.character_id == body.character_id
-    ).first()
+    owned = db.execute(
+        select(
+            exists().where(
+                UserCharacter.user_id == current_user.id,
+                UserCharacter.character_id == body.character_id,
+            )
+        )
+    ).scalar()
     if not owned:
         raise HTTPException(status_code=400, detail="not_owned")
 
-    # hepsini pasif yap
-    db.query(UserCharacter).filter(UserCharacter.user_id == current_user.id).update({"is_active": False})
-    # seçileni aktif yap
-    owned.is_active = True
+    # Tek UPDATE: önceki aktif satır + hedef satır dışında hiçbir satıra
+    # dokunmadan is_active bayrağını taşır (eski "hepsini pasifle, sonra
+    # birini aktifle" çifti yerine).
+    db.execute(
+        update(UserCharacter)
+        .where(
+            UserCharacter.user_id == current_user.id,
+            or_(
+                UserCharacter.is_active.is_(True),
+                UserCharacter.character_id == body.character_id,
+            ),
+        )
+        .values(is_active=(UserCharacter.character_id == body.character_id))
+    )
     db.commit()
 
+    _bust_chars_cache(current_user.id)
     return get_user_characters(db, current_user)
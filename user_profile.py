@@ -1,10 +1,14 @@
+import threading
+import time as time_mod
 from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from database import get_db
 from models import User, UserProfile
@@ -22,8 +26,7 @@ class ProfileResponse(BaseModel):
     email: EmailStr
     birth_date: Optional[date] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProfileUpdateRequest(BaseModel):
@@ -54,12 +57,6 @@ def update_profile(
         )
 
     if payload.email and payload.email != current_user.email:
-        existing = db.query(User).filter(User.email == payload.email).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already in use",
-            )
         current_user.email = payload.email
 
     if payload.name:
@@ -68,9 +65,24 @@ def update_profile(
     if payload.birth_date is not None:
         current_user.birth_date = payload.birth_date
 
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    # current_user is already session-managed; dirty tracking picks up the
+    # attribute writes, and with expire_on_commit off a refresh would just
+    # re-SELECT what we have. The unique indexes on users.email/username
+    # arbitrate conflicts — no pre-check SELECT, no window for two requests
+    # to claim the same value.
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        constraint = (
+            getattr(getattr(getattr(e, "orig", None), "diag", None), "constraint_name", None)
+            or ""
+        )
+        field = "Username" if "username" in constraint else "Email"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{field} already in use",
+        )
 
     return ProfileResponse(
         name=current_user.username,
@@ -90,8 +102,7 @@ class AIProfileResponse(BaseModel):
     support_topics: Optional[str] = None
     location: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AIProfileUpdateRequest(BaseModel):
@@ -102,20 +113,42 @@ class AIProfileUpdateRequest(BaseModel):
     location: Optional[str] = None
 
 
+# The AI profile is read on every profile screen load but only changes via
+# the PUT below or a personality submit; cache the row's fields per user.
+# /profile needs no cache — it renders from the already-authenticated user.
+_AI_PROFILE_TTL_SECONDS = 300.0
+_ai_profile_cache: dict[int, tuple[float, AIProfileResponse]] = {}
+_ai_profile_cache_lock = threading.Lock()
+
+
+def bust_ai_profile_cache(user_id: int) -> None:
+    with _ai_profile_cache_lock:
+        _ai_profile_cache.pop(user_id, None)
+
+
 @router.get("/ai-profile", response_model=AIProfileResponse)
 def get_ai_profile(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    profile = (
-        db.query(UserProfile)
-        .filter(UserProfile.user_id == current_user.id)
-        .order_by(desc(UserProfile.id))
-        .first()
-    )
-    if not profile:
-        return AIProfileResponse()
-    return profile
+    with _ai_profile_cache_lock:
+        hit = _ai_profile_cache.get(current_user.id)
+    if hit is not None and time_mod.monotonic() - hit[0] < _AI_PROFILE_TTL_SECONDS:
+        return hit[1]
+
+    row = db.execute(
+        select(
+            UserProfile.age_range,
+            UserProfile.gender,
+            UserProfile.mood,
+            UserProfile.support_topics,
+            UserProfile.location,
+        ).where(UserProfile.user_id == current_user.id)
+    ).mappings().first()
+    resp = AIProfileResponse(**row) if row else AIProfileResponse()
+    with _ai_profile_cache_lock:
+        _ai_profile_cache[current_user.id] = (time_mod.monotonic(), resp)
+    return resp
 
 
 @router.put("/ai-profile", response_model=AIProfileResponse)
@@ -134,30 +167,21 @@ def upsert_ai_profile(
     ):
         raise HTTPException(status_code=400, detail="Nothing to update.")
 
-    # En güncel profili çek, yoksa yeni oluştur
-    profile = (
-        db.query(UserProfile)
-        .filter(UserProfile.user_id == current_user.id)
-        .order_by(desc(UserProfile.id))
-        .first()
-    )
-
-    if not profile:
-        profile = UserProfile(user_id=current_user.id)
-
-    if payload.age_range is not None:
-        profile.age_range = payload.age_range
-    if payload.gender is not None:
-        profile.gender = payload.gender
-    if payload.mood is not None:
-        profile.mood = payload.mood
-    if payload.support_topics is not None:
-        profile.support_topics = payload.support_topics
-    if payload.location is not None:
-        profile.location = payload.location
-
-    db.add(profile)
+    # Tek atomik UPSERT: user_id artık unique, ON CONFLICT sadece gelen
+    # alanları günceller — eski SELECT + INSERT/UPDATE çifti yerine.
+    values = payload.model_dump(exclude_none=True)
+    ins = pg_insert(UserProfile).values(user_id=current_user.id, **values)
+    row = db.execute(
+        ins.on_conflict_do_update(index_elements=[UserProfile.user_id], set_=values)
+        .returning(
+            UserProfile.age_range,
+            UserProfile.gender,
+            UserProfile.mood,
+            UserProfile.support_topics,
+            UserProfile.location,
+        )
+    ).mappings().one()
     db.commit()
-    db.refresh(profile)
 
-    return profile
+    bust_ai_profile_cache(current_user.id)
+    return AIProfileResponse(**row)